@@ -0,0 +1,229 @@
+"""
+Static code skeletons for the Python code generator
+
+Each constant is the complete block emitted for one tool type;
+PythonCodeGenerator fills it with a single str.format_map call per tool
+instead of interpolating every line through its own f-string. Doubled
+braces survive formatting, so the emitted code keeps its nested
+f-string placeholders (e.g. {{len(df)}} becomes {len(df)}).
+"""
+
+INPUT_DATA = """\
+# Read input file: {file_path}
+if '{file_path}' in __inputs__:
+    {var_name} = __inputs__['{file_path}']
+else:
+    {var_name} = {read_expr}
+print(f'Loaded {{len({var_name})}} rows from {file_path}')"""
+
+OUTPUT_DATA = """\
+# Write output file: {file_path}
+{write_expr}
+__outputs__['{file_path}'] = {source_var}
+print(f'Wrote {{len({source_var})}} rows to {file_path}')"""
+
+FILTER = """\
+# Apply filter
+{var_name} = {source_var}[{pandas_expr}]
+print(f'Filter: {{len({var_name})}} rows (from {{len({source_var})}})')"""
+
+FILTER_TODO = """\
+# Apply filter
+# TODO: Add filter condition
+{var_name} = {source_var}.copy()
+print(f'Filter: {{len({var_name})}} rows (from {{len({source_var})}})')"""
+
+SELECT = """\
+# Select and configure fields
+{var_name} = {source_var}
+# TODO: Apply field selections and type conversions"""
+
+FORMULA = """\
+# Apply formula
+{var_name} = {source_var}.assign(**{{'{output_field}': {pandas_expr}}})"""
+
+FORMULA_NUMBA = """\
+# Apply formula (compiled numeric fast path)
+@njit(cache=True, fastmath=True)
+def _k_{tool_id}({params}):
+    return {kernel_expr}
+{var_name} = {source_var}.assign(**{{'{output_field}': _k_{tool_id}({args})}})"""
+
+FORMULA_TODO = """\
+# Apply formula
+# TODO: Add formula expression
+{var_name} = {source_var}.assign(**{{'{output_field}': None}})"""
+
+JOIN = """\
+# Join two datasets
+# TODO: Specify join keys
+{var_name} = pd.merge(
+    {left_var},
+    {right_var},
+    on='key_column',  # Specify join column(s)
+    how='{join_type}'
+)
+print(f'Join: {{len({var_name})}} rows')"""
+
+UNION_SINGLE = """\
+# Union multiple datasets (single input: alias, no copy)
+{var_name} = {source_var}
+print(f'Union: {{len({var_name})}} rows')"""
+
+UNION = """\
+# Union multiple datasets; result may share blocks with its inputs
+{var_name} = pd.concat([{union_list}], ignore_index=True{concat_kwargs})
+print(f'Union: {{len({var_name})}} rows')"""
+
+SORT = """\
+# Sort data
+# TODO: Specify sort columns and order
+{var_name} = {source_var}.sort_values('column_name', ascending=True, kind='stable', ignore_index=True)"""
+
+SUMMARIZE = """\
+# Summarize/Group by
+# TODO: Specify group by columns and aggregations
+# Category-coded keys group on integer codes; observed=True skips
+# unobserved combinations and sort=False skips the key sort
+{source_var}['group_column'] = {source_var}['group_column'].astype('category')
+{var_name} = {source_var}.groupby('group_column', observed=True, sort=False).agg({{
+    'value_column': 'sum',
+    'count_column': 'count'
+}}{agg_kwargs}).reset_index()"""
+
+UNIQUE = """\
+# Remove duplicates
+{var_name} = {source_var}.drop_duplicates({dedup_args})
+print(f'Unique: {{len({var_name})}} rows (from {{len({source_var})}})')"""
+
+SAMPLE = """\
+# Sample records
+{var_name} = {source_var}.sample(n={sample_size}, random_state=42)"""
+
+SAMPLE_FIRST = """\
+# Sample records (first N: zero-copy slice)
+{var_name} = {source_var}.head({sample_size})"""
+
+SAMPLE_LAST = """\
+# Sample records (last N: zero-copy slice)
+{var_name} = {source_var}.tail({sample_size})"""
+
+SAMPLE_SKIP = """\
+# Sample records (skip first N)
+{var_name} = {source_var}.iloc[{sample_size}:]"""
+
+SAMPLE_PERCENT = """\
+# Sample records (random N percent)
+{var_name} = {source_var}.sample(frac={sample_size} / 100, random_state=42)"""
+
+RECORD_ID = """\
+# Add record ID
+{var_name} = {source_var}.assign(RecordID=np.arange(1, len({source_var}) + 1))"""
+
+TEXT_TO_COLUMNS = """\
+# Split text column
+# TODO: Specify column to split
+split_cols = {source_var}['text_column'].str.split('{delimiter}', expand=True)
+{var_name} = pd.concat([{source_var}, split_cols], axis=1)"""
+
+CROSS_TAB = """\
+# Create cross-tabulation
+# TODO: Specify row, column, and value fields
+{var_name} = pd.pivot_table(
+    {source_var},
+    values='value_column',
+    index='row_column',
+    columns='column_column',
+    aggfunc='sum'
+).reset_index()"""
+
+TRANSPOSE = """\
+# Transpose data
+{var_name} = {source_var}.transpose()"""
+
+BROWSE = """\
+# Display data (Browse equivalent)
+print(f'\\nBrowse - First 10 rows:')
+print({source_var}.head(10))
+print(f'\\nShape: {{{source_var}.shape}}')"""
+
+GENERIC = """\
+# Tool type '{tool_type}' - requires manual implementation
+{var_name} = {source_var}.copy()
+# TODO: Implement {tool_type} logic"""
+
+GENERIC_NO_SOURCE = """\
+# Tool type '{tool_type}' - requires manual implementation
+# No source data available"""
+
+# ---------------------------------------------------------------------
+# Polars backend (PythonCodeGenerator(parser, backend='polars')):
+# lazy pipelines that the query optimizer can fuse, sunk to disk
+# without materializing where possible
+# ---------------------------------------------------------------------
+
+POLARS_INPUT = """\
+# Read input file: {file_path} (lazy scan)
+{var_name} = pl.scan_csv('{file_path}')"""
+
+POLARS_INPUT_EXCEL = """\
+# Read input file: {file_path}
+{var_name} = pl.read_excel('{file_path}').lazy()"""
+
+POLARS_OUTPUT = """\
+# Write output file: {file_path} (streaming sink)
+{source_var}.sink_csv('{file_path}')
+print(f'Wrote {file_path}')"""
+
+POLARS_FILTER = """\
+# Apply filter
+{var_name} = {source_var}.filter({polars_expr})"""
+
+POLARS_FORMULA = """\
+# Apply formula
+{var_name} = {source_var}.with_columns(({polars_expr}).alias('{output_field}'))"""
+
+POLARS_SORT = """\
+# Sort data
+# TODO: Specify sort columns and order
+{var_name} = {source_var}.sort('column_name')"""
+
+POLARS_SUMMARIZE = """\
+# Summarize/Group by
+# TODO: Specify group by columns and aggregations
+{var_name} = {source_var}.group_by('group_column').agg([
+    pl.col('value_column').sum(),
+    pl.col('count_column').count()
+])"""
+
+POLARS_UNIQUE = """\
+# Remove duplicates
+{var_name} = {source_var}.unique({unique_args}keep='first')"""
+
+POLARS_UNION = """\
+# Union multiple datasets
+{var_name} = pl.concat([{union_list}])"""
+
+POLARS_SAMPLE_FIRST = """\
+# Sample records (first N)
+{var_name} = {source_var}.head({sample_size})"""
+
+POLARS_SAMPLE_LAST = """\
+# Sample records (last N)
+{var_name} = {source_var}.tail({sample_size})"""
+
+POLARS_SAMPLE_SKIP = """\
+# Sample records (skip first N)
+{var_name} = {source_var}.slice({sample_size}, None)"""
+
+POLARS_SAMPLE_RANDOM = """\
+# Sample records (random: requires materializing)
+{var_name} = {source_var}.collect().sample(n={sample_size}, seed=42).lazy()"""
+
+POLARS_BROWSE = """\
+# Display data (Browse equivalent)
+print({source_var}.limit(10).collect())"""
+
+POLARS_GENERIC = """\
+# Tool type '{tool_type}' - no polars emitter yet; passing frame through
+{var_name} = {source_var}"""
@@ -1,6 +1,130 @@
-import xml.etree.ElementTree as ET
+try:
+    import lxml.etree as ET
+    _HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _HAVE_LXML = False
+
+import io
+import logging
 import re
-from typing import Dict, List, Any, Optional
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Malformed XML or bad values are expected failure modes; anything else
+# is a bug and should propagate
+_PARSE_ERRORS = (ET.XMLSyntaxError, ValueError) if _HAVE_LXML else (ET.ParseError, ValueError)
+
+if _HAVE_LXML:
+    def _compile_find(path):
+        """Compile a relative path once into a find()-style callable"""
+        xpath = ET.XPath(path)
+
+        def _find(elem):
+            result = xpath(elem)
+            return result[0] if result else None
+        return _find
+else:
+    def _compile_find(path):
+        """Stdlib fallback: plain find() with the path bound once"""
+        def _find(elem):
+            return elem.find(path)
+        return _find
+
+# Compiled once at import; re-parsing the path string per find() call
+# adds up when many workflows are processed in one session
+_find_engine_settings = _compile_find('EngineSettings')
+_find_properties = _compile_find('Properties')
+_find_configuration = _compile_find('Configuration')
+_find_gui_settings = _compile_find('GuiSettings')
+_find_position = _compile_find('Position')
+_find_annotation = _compile_find('Annotation')
+_find_name = _compile_find('Name')
+_find_origin = _compile_find('Origin')
+_find_destination = _compile_find('Destination')
+_find_meta_info = _compile_find('MetaInfo')
+
+
+def _extract_config(element: ET.Element, config: Dict, prefix: str = ''):
+    """Extract a nested configuration dict from an XML element.
+
+    Walks with an explicit stack rather than recursion: deep Alteryx
+    configurations were paying a Python function call per nested element.
+    """
+    stack = [(element, config, prefix)]
+    while stack:
+        el, out, pfx = stack.pop()
+        for child in el:
+            key = f"{pfx}{child.tag}" if pfx else child.tag
+            if type(key) is str:
+                # Config tags repeat heavily across tools; intern for
+                # shared storage and identity-fast dict lookups
+                key = sys.intern(key)
+
+            # If element has children, descend
+            if len(child) > 0:
+                sub_config = {}
+                out[key] = sub_config
+                stack.append((child, sub_config, ''))
+            else:
+                # Store text or attributes
+                if child.text and child.text.strip():
+                    out[key] = child.text.strip()
+                elif child.attrib:
+                    out[key] = child.attrib
+                else:
+                    out[key] = None
+
+
+class Tool:
+    """Parsed workflow tool with a fixed slot layout.
+
+    Dict-style access (tool['id'], tool.get('config')) is kept for
+    callers written against the original per-tool dicts. The nested
+    configuration dict is built lazily from the serialized
+    <Configuration> element: graph-only consumers (execution order,
+    connection lookups) never pay for the extraction walk.
+    """
+
+    __slots__ = ('id', 'type', 'plugin', 'macro', 'gui', 'annotation',
+                 '_config_raw', '_config')
+
+    def __init__(self, id, type, plugin, macro, gui, annotation, config_raw=None):
+        self.id = id
+        self.type = type
+        self.plugin = plugin
+        self.macro = macro
+        self.gui = gui
+        self.annotation = annotation
+        self._config_raw = config_raw
+        self._config = None
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Nested configuration dict, materialized on first access"""
+        if self._config is None:
+            config = {}
+            if self._config_raw:
+                _extract_config(ET.fromstring(self._config_raw), config)
+            self._config = config
+        return self._config
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key, default=None):
+        return getattr(self, key, default)
+
+    def __repr__(self):
+        return f"Tool(id={self.id!r}, type={self.type!r})"
+
 
 class AdvancedAlteryxParser:
     """Advanced parser for Alteryx workflows with detailed tool configuration extraction"""
@@ -48,30 +172,116 @@ class AdvancedAlteryxParser:
         'Comment': 'comment',
         'Tool Container': 'container'
     }
-    
+
+    # Config-key keyword -> tool type, checked in priority order
+    KEYWORD_TO_TYPE = {
+        'filter': 'filter',
+        'join': 'join',
+        'sort': 'sort',
+        'summarize': 'summarize',
+        'groupby': 'summarize',
+        'formula': 'formula',
+        'select': 'select',
+        'unique': 'unique',
+        'sample': 'sample',
+        'recordid': 'record_id'
+    }
+
+    # Tool name embedded in the plugin path (e.g. "...;AlteryxFilter")
+    # is authoritative; one compiled scan replaces the config probing
+    _PLUGIN_TYPE_RE = re.compile(
+        r'(Filter|Join|Sort|Summarize|Formula|Select|Unique|Sample|RecordID)',
+        re.IGNORECASE)
+
+    # Union of KEYWORD_TO_TYPE keys, compiled once at import: a single
+    # C-level scan over the joined config keys instead of a Python loop
+    # of substring tests per tool
+    _ENGINE_KEYWORD_RE = re.compile(
+        r'filter|join|sort|summarize|groupby|formula|select|unique|sample|recordid')
+
     def __init__(self):
-        self.tools: List[Dict[str, Any]] = []
+        self.tools: List[Tool] = []
         self.connections: List[Dict[str, Any]] = []
         self.metadata: Dict[str, Any] = {}
+        # Lookup indexes, maintained incrementally during parse
+        self.tools_by_type: Dict[str, List[Tool]] = {}
+        self._tool_by_id: Dict[str, Tool] = {}
+        self._by_source: Dict[str, List[str]] = {}
+        self._by_dest: Dict[str, List[str]] = {}
         
     def parse(self, xml_content: bytes) -> bool:
-        """Parse Alteryx workflow XML"""
+        """Parse Alteryx workflow XML from a bytes blob"""
+        return self.parse_stream(io.BytesIO(xml_content))
+
+    def parse_stream(self, stream) -> bool:
+        """Parse Alteryx workflow XML incrementally from a binary
+        file-like object.
+
+        Uses iterparse so tools and connections are extracted as their
+        elements close, then released, keeping peak memory independent
+        of the workflow file size. Callers holding an open file (or a
+        Streamlit UploadedFile) can pass it directly without first
+        copying the whole document into memory.
+        """
         try:
-            root = ET.fromstring(xml_content)
-            
-            # Extract metadata
+            root = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    continue
+
+                tag = elem.tag
+                if tag == 'Node':
+                    tool_info = self._parse_tool_node(elem)
+                    if tool_info:
+                        self.tools.append(tool_info)
+                        self._tool_by_id[tool_info.id] = tool_info
+                        self.tools_by_type.setdefault(tool_info.type, []).append(tool_info)
+                    self._release_element(elem)
+                elif tag == 'Connection':
+                    self._append_connection(elem)
+                    self._release_element(elem)
+
+            if root is None:
+                return False
+
+            # Extract metadata (workflow-level elements survive the streaming pass)
             self._extract_metadata(root)
-            
-            # Extract all nodes (tools)
-            self._extract_tools(root)
-            
-            # Extract connections
-            self._extract_connections(root)
-            
+
             return True
-        except Exception as e:
-            print(f"Parsing error: {e}")
+        except _PARSE_ERRORS:
+            logger.exception("Parsing error")
             return False
+
+    def _append_connection(self, connection: ET.Element):
+        """Record a single connection and update the adjacency indexes"""
+        origin = _find_origin(connection)
+        destination = _find_destination(connection)
+
+        if origin is not None and destination is not None:
+            conn_info = {
+                'name': connection.get('name', 'Output'),
+                'source': origin.text.strip() if origin.text else '',
+                'destination': destination.text.strip() if destination.text else ''
+            }
+            self.connections.append(conn_info)
+            self._by_source.setdefault(conn_info['source'], []).append(conn_info['destination'])
+            self._by_dest.setdefault(conn_info['destination'], []).append(conn_info['source'])
+
+    @staticmethod
+    def _release_element(elem):
+        """Drop a processed element's subtree to cap resident memory"""
+        elem.clear()
+        if _HAVE_LXML:
+            # Also detach already-processed siblings so the partial tree
+            # doesn't accumulate empty Node/Connection shells
+            parent = elem.getparent()
+            prev = elem.getprevious()
+            while prev is not None and prev.tag in ('Node', 'Connection'):
+                older = prev.getprevious()
+                parent.remove(prev)
+                prev = older
     
     def _extract_metadata(self, root: ET.Element):
         """Extract workflow metadata"""
@@ -83,83 +293,82 @@ class AdvancedAlteryxParser:
         }
         
         # Try to extract additional metadata
-        properties = root.find('.//Properties')
+        properties = _find_properties(root)
         if properties is not None:
-            meta = properties.find('.//MetaInfo')
+            meta = _find_meta_info(properties)
             if meta is not None:
                 for child in meta:
                     if child.tag in ['Author', 'Description', 'CreationDate']:
                         self.metadata[child.tag.lower()] = child.text
     
-    def _extract_tools(self, root: ET.Element):
-        """Extract all tools from the workflow"""
-        for node in root.findall('.//Node'):
-            tool_info = self._parse_tool_node(node)
-            if tool_info:
-                self.tools.append(tool_info)
-    
-    def _parse_tool_node(self, node: ET.Element) -> Optional[Dict[str, Any]]:
+    def _parse_tool_node(self, node: ET.Element) -> Optional[Tool]:
         """Parse individual tool node"""
         tool_id = node.get('ToolID')
         if not tool_id:
             return None
         
-        # Get plugin information
-        engine_settings = node.find('.//EngineSettings')
-        plugin = engine_settings.get('EngineDll', '') if engine_settings is not None else ''
-        macro = engine_settings.get('Macro', '') if engine_settings is not None else ''
+        # Get plugin information; interned so the handful of distinct
+        # plugin/macro values are shared across thousands of tools
+        engine_settings = _find_engine_settings(node)
+        plugin = sys.intern(engine_settings.get('EngineDll', '')) if engine_settings is not None else ''
+        macro = sys.intern(engine_settings.get('Macro', '')) if engine_settings is not None else ''
         
         # Get GUI settings
         gui = self._extract_gui_settings(node)
         
-        # Get properties
-        properties = node.find('.//Properties')
-        config = self._extract_detailed_config(properties) if properties is not None else {}
-        
-        # Identify tool type
-        tool_type = self._identify_tool_type(plugin, macro, config)
-        
-        return {
-            'id': tool_id,
-            'type': tool_type,
-            'plugin': plugin,
-            'macro': macro,
-            'config': config,
-            'gui': gui,
-            'annotation': self._extract_annotation(node)
-        }
-    
-    def _identify_tool_type(self, plugin: str, macro: str, config: Dict) -> str:
-        """Identify tool type from plugin and configuration"""
+        # Get properties; keep the raw <Configuration> bytes for the lazy
+        # config property and only read its top-level tags for typing
+        properties = _find_properties(node)
+        configuration = _find_configuration(properties) if properties is not None else None
+
+        if configuration is not None:
+            top_keys = frozenset(child.tag for child in configuration if type(child.tag) is str)
+            config_raw = ET.tostring(configuration)
+        else:
+            top_keys = frozenset()
+            config_raw = None
+
+        # Identify tool type (keys lowercased once here rather than per probe)
+        keys_lower = frozenset(k.lower() for k in top_keys)
+        tool_type = self._identify_tool_type(plugin, macro, top_keys, keys_lower)
+
+        return Tool(
+            id=tool_id,
+            type=tool_type,
+            plugin=plugin,
+            macro=macro,
+            gui=gui,
+            annotation=self._extract_annotation(properties),
+            config_raw=config_raw
+        )
+
+    def _identify_tool_type(self, plugin: str, macro: str, top_keys: frozenset,
+                            keys_lower: frozenset) -> str:
+        """Identify tool type from plugin and top-level configuration keys"""
         # Check for specific tool indicators in config
-        if 'File' in config:
-            if 'FileName_Out' in config or any('output' in str(k).lower() for k in config.keys()):
+        if 'File' in top_keys:
+            if 'filename_out' in keys_lower or any('output' in k for k in keys_lower):
                 return 'output_data'
             else:
                 return 'input_data'
-        
+
         # Check plugin DLL
         if 'AlteryxBasePluginsEngine' in plugin:
-            # Try to determine from config keys
-            config_str = str(config).lower()
-            if 'filter' in config_str:
-                return 'filter'
-            elif 'join' in config_str:
-                return 'join'
-            elif 'sort' in config_str:
-                return 'sort'
-            elif 'summarize' in config_str or 'groupby' in config_str:
-                return 'summarize'
-            elif 'formula' in config_str:
-                return 'formula'
-            elif 'select' in config_str:
-                return 'select'
-            elif 'unique' in config_str:
-                return 'unique'
-            elif 'sample' in config_str:
-                return 'sample'
-            elif 'recordid' in config_str:
-                return 'record_id'
+            # A tool name in the plugin string settles it outright
+            match = self._PLUGIN_TYPE_RE.search(plugin)
+            if match:
+                return self.KEYWORD_TO_TYPE[match.group(1).lower()]
+
+            # Otherwise try to determine from config keys: collect every
+            # keyword hit in one compiled scan, then resolve ties in
+            # KEYWORD_TO_TYPE declaration order - keys_lower is a set,
+            # so picking the first match of the joined string would make
+            # the winner depend on hash ordering
+            hits = set(self._ENGINE_KEYWORD_RE.findall(' '.join(keys_lower)))
+            if hits:
+                for keyword, tool_type in self.KEYWORD_TO_TYPE.items():
+                    if keyword in hits:
+                        return tool_type
         
         elif 'AlteryxBasePluginsGui' in plugin:
             if 'browse' in plugin.lower():
@@ -169,49 +378,17 @@ class AdvancedAlteryxParser:
         
         # Check for macros
         if macro:
-            return f'macro:{macro}'
+            return sys.intern(f'macro:{macro}')
         
         return 'unknown'
-    
-    def _extract_detailed_config(self, properties: ET.Element) -> Dict[str, Any]:
-        """Extract detailed configuration from properties"""
-        config = {}
-        
-        configuration = properties.find('.//Configuration')
-        if configuration is None:
-            return config
-        
-        # Recursively extract all configuration elements
-        self._recursive_config_extract(configuration, config)
-        
-        return config
-    
-    def _recursive_config_extract(self, element: ET.Element, config: Dict, prefix: str = ''):
-        """Recursively extract configuration from XML element"""
-        for child in element:
-            key = f"{prefix}{child.tag}" if prefix else child.tag
-            
-            # If element has children, recurse
-            if len(child) > 0:
-                sub_config = {}
-                self._recursive_config_extract(child, sub_config, '')
-                config[key] = sub_config
-            else:
-                # Store text or attributes
-                if child.text and child.text.strip():
-                    config[key] = child.text.strip()
-                elif child.attrib:
-                    config[key] = child.attrib
-                else:
-                    config[key] = None
-    
+
     def _extract_gui_settings(self, node: ET.Element) -> Dict[str, Any]:
         """Extract GUI settings"""
         gui_settings = {}
         
-        gui = node.find('.//GuiSettings')
+        gui = _find_gui_settings(node)
         if gui is not None:
-            position = gui.find('.//Position')
+            position = _find_position(gui)
             if position is not None:
                 gui_settings['position'] = {
                     'x': float(position.get('x', 0)),
@@ -220,83 +397,98 @@ class AdvancedAlteryxParser:
         
         return gui_settings
     
-    def _extract_annotation(self, node: ET.Element) -> Optional[str]:
-        """Extract tool annotation/comment"""
-        properties = node.find('.//Properties')
+    def _extract_annotation(self, properties: Optional[ET.Element]) -> Optional[str]:
+        """Extract tool annotation/comment from an already-located Properties element"""
         if properties is not None:
-            annotation = properties.find('.//Annotation')
+            annotation = _find_annotation(properties)
             if annotation is not None:
-                name = annotation.find('.//Name')
+                name = _find_name(annotation)
                 if name is not None and name.text:
                     return name.text.strip()
         return None
     
-    def _extract_connections(self, root: ET.Element):
-        """Extract connections between tools"""
-        for connection in root.findall('.//Connection'):
-            origin = connection.find('.//Origin')
-            destination = connection.find('.//Destination')
-            
-            if origin is not None and destination is not None:
-                conn_info = {
-                    'name': connection.get('name', 'Output'),
-                    'source': origin.text.strip() if origin.text else '',
-                    'destination': destination.text.strip() if destination.text else ''
-                }
-                self.connections.append(conn_info)
-    
     def get_execution_order(self) -> List[str]:
         """Determine tool execution order using topological sort"""
-        # Build adjacency list
-        graph = {}
-        in_degree = {}
-        
-        for tool in self.tools:
-            tool_id = tool['id']
-            graph[tool_id] = []
-            in_degree[tool_id] = 0
-        
-        for conn in self.connections:
-            source = conn['source']
-            dest = conn['destination']
-            if source in graph and dest in graph:
-                graph[source].append(dest)
-                in_degree[dest] = in_degree.get(dest, 0) + 1
-        
+        # Count incoming edges from the prebuilt adjacency index
+        in_degree = {tool.id: 0 for tool in self.tools}
+
+        for source, destinations in self._by_source.items():
+            if source not in in_degree:
+                continue
+            for dest in destinations:
+                if dest in in_degree:
+                    in_degree[dest] += 1
+
         # Topological sort using Kahn's algorithm
-        queue = [tool_id for tool_id, degree in in_degree.items() if degree == 0]
+        queue = deque(tool_id for tool_id, degree in in_degree.items() if degree == 0)
         result = []
-        
+
         while queue:
-            node = queue.pop(0)
+            node = queue.popleft()
             result.append(node)
-            
-            for neighbor in graph.get(node, []):
+
+            for neighbor in self._by_source.get(node, ()):
+                if neighbor not in in_degree:
+                    continue
                 in_degree[neighbor] -= 1
                 if in_degree[neighbor] == 0:
                     queue.append(neighbor)
-        
+
         return result
-    
-    def get_tool_by_id(self, tool_id: str) -> Optional[Dict[str, Any]]:
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Snapshot parsed state so results can be cached/pickled and
+        rehydrated without re-parsing"""
+        return {
+            'tools': self.tools,
+            'connections': self.connections,
+            'metadata': self.metadata,
+            'tools_by_type': self.tools_by_type,
+            '_tool_by_id': self._tool_by_id,
+            '_by_source': self._by_source,
+            '_by_dest': self._by_dest
+        }
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self.tools = state['tools']
+        self.connections = state['connections']
+        self.metadata = state['metadata']
+        self.tools_by_type = state['tools_by_type']
+        self._tool_by_id = state['_tool_by_id']
+        self._by_source = state['_by_source']
+        self._by_dest = state['_by_dest']
+
+    @classmethod
+    def parse_many(cls, xml_blobs: Iterable[bytes],
+                   workers: Optional[int] = None) -> List[Optional['AdvancedAlteryxParser']]:
+        """Parse many workflow XML blobs across worker processes.
+
+        Parsing is CPU-bound and independent per file, so bulk ingestion
+        fans out to a process pool. Returns one parser per blob, in input
+        order, with None for blobs that failed to parse.
+        """
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(_parse_one, xml_blobs, chunksize=8))
+
+    @property
+    def tools_by_id(self) -> Dict[str, Tool]:
+        """Read-only view of the id -> tool index built during parse"""
+        return self._tool_by_id
+
+    def get_tool_by_id(self, tool_id: str) -> Optional[Tool]:
         """Get tool configuration by ID"""
-        for tool in self.tools:
-            if tool['id'] == tool_id:
-                return tool
-        return None
-    
+        return self._tool_by_id.get(tool_id)
+
     def get_source_tools(self, tool_id: str) -> List[str]:
         """Get all tools that feed into the specified tool"""
-        sources = []
-        for conn in self.connections:
-            if conn['destination'] == tool_id:
-                sources.append(conn['source'])
-        return sources
-    
+        return self._by_dest.get(tool_id, [])
+
     def get_destination_tools(self, tool_id: str) -> List[str]:
         """Get all tools that this tool feeds into"""
-        destinations = []
-        for conn in self.connections:
-            if conn['source'] == tool_id:
-                destinations.append(conn['destination'])
-        return destinations
+        return self._by_source.get(tool_id, [])
+
+
+def _parse_one(xml_blob: bytes) -> Optional[AdvancedAlteryxParser]:
+    """Worker entry point for parse_many (module-level so it pickles)"""
+    parser = AdvancedAlteryxParser()
+    return parser if parser.parse(xml_blob) else None
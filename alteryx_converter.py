@@ -1,12 +1,71 @@
 import streamlit as st
-import xml.etree.ElementTree as ET
+
+try:
+    # libxml2-backed parser; same iterparse API, several times faster
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
 import pandas as pd
+import numpy as np
+import hashlib
 import io
 import os
 import json
+import re
+from collections import deque
 from datetime import datetime
 from pathlib import Path
 
+
+class CycleDetectedError(ValueError):
+    """Raised when workflow connections form a cycle and no valid
+    execution order exists."""
+
+# Known Alteryx plugin DLLs and the tool names they host; built once at
+# import instead of per _identify_tool_type call
+_TOOL_MAPPING = {
+    'AlteryxBasePluginsEngine.dll': {
+        'Input': 'input_data',
+        'Output': 'output_data',
+        'Select': 'select',
+        'Filter': 'filter',
+        'Formula': 'formula',
+        'Join': 'join',
+        'Sort': 'sort',
+        'Unique': 'unique',
+        'Sample': 'sample',
+        'Summarize': 'summarize',
+        'RecordID': 'record_id'
+    },
+    'AlteryxBasePluginsGui.dll': {
+        'BrowseV2': 'browse',
+        'TextInput': 'text_input'
+    }
+}
+
+_PLUGIN_DLLS = tuple(_TOOL_MAPPING)
+
+# Field references, numeric literals, arithmetic/comparison operators
+# and whitespace only: expressions a numba kernel over raw column
+# arrays can handle. Anything else (string functions, IF blocks)
+# stays on the plain-pandas path
+_NUMERIC_EXPR_RE = re.compile(r'^(?:\[[^\]]+\]|[\d.]+|[-+*/%()<>=!\s])+$')
+
+
+def _is_numeric_expression(expr):
+    """True when a config Expression is purely numeric arithmetic"""
+    return isinstance(expr, str) and bool(_NUMERIC_EXPR_RE.match(expr))
+
+# Base globals handed to executed workflow scripts; copied per run so
+# executions don't leak state into each other
+_EXEC_GLOBALS_TEMPLATE = {
+    'pd': pd,
+    'np': np,
+    'datetime': datetime
+}
+
+
 class AlteryxWorkflowAnalyzer:
     """Analyzes and converts Alteryx workflows to Python scripts"""
     
@@ -16,70 +75,100 @@ class AlteryxWorkflowAnalyzer:
         self.workflow_config = {}
         self.input_files = {}
         self.output_specs = []
+        self._by_dest = {}
+        self._uses_numba = False
+        self._analysis_cache = None
         
     def parse_workflow(self, yxmd_content):
-        """Parse Alteryx .yxmd workflow file"""
+        """Parse Alteryx .yxmd workflow file.
+
+        Accepts raw bytes or a binary file-like object (e.g. the
+        Streamlit UploadedFile). Streams the document with iterparse,
+        handling tools and connections in one pass as their elements
+        close and clearing each processed subtree, instead of
+        materializing the full DOM and traversing it twice.
+        """
+        self._analysis_cache = None
         try:
-            root = ET.fromstring(yxmd_content)
-            
-            # Extract nodes (tools)
-            for node in root.findall('.//Node'):
-                tool_id = node.get('ToolID')
-                plugin = node.find('.//EngineSettings').get('EngineDll') if node.find('.//EngineSettings') is not None else ''
-                
-                # Get tool configuration
-                properties = node.find('.//Properties')
-                config = self._extract_config(properties) if properties is not None else {}
-                
-                tool_info = {
-                    'id': tool_id,
-                    'plugin': plugin,
-                    'type': self._identify_tool_type(plugin),
-                    'config': config,
-                    'gui_settings': self._extract_gui_settings(node)
-                }
-                self.tools.append(tool_info)
-            
-            # Extract connections between tools
-            for connection in root.findall('.//Connection'):
-                conn_info = {
-                    'origin': connection.get('name'),
-                    'source': connection.find('.//Origin').text if connection.find('.//Origin') is not None else '',
-                    'destination': connection.find('.//Destination').text if connection.find('.//Destination') is not None else ''
-                }
-                self.connections.append(conn_info)
-            
-            return True
+            if hasattr(yxmd_content, 'read'):
+                stream = yxmd_content
+            else:
+                stream = io.BytesIO(yxmd_content)
+            root = None
+            for event, elem in ET.iterparse(stream, events=('start', 'end')):
+                if event == 'start':
+                    if root is None:
+                        root = elem
+                    continue
+
+                if elem.tag == 'Node':
+                    tool_id = elem.get('ToolID')
+                    engine_settings = elem.find('EngineSettings')
+                    plugin = engine_settings.get('EngineDll') if engine_settings is not None else ''
+
+                    # Get tool configuration
+                    properties = elem.find('Properties')
+                    config = self._extract_config(properties) if properties is not None else {}
+
+                    tool_info = {
+                        'id': tool_id,
+                        'plugin': plugin,
+                        'type': self._identify_tool_type(plugin),
+                        'kind': self._classify(plugin, config),
+                        'config': config,
+                        'gui_settings': self._extract_gui_settings(elem)
+                    }
+                    self.tools.append(tool_info)
+                    elem.clear()
+                elif elem.tag == 'Connection':
+                    origin = elem.find('Origin')
+                    destination = elem.find('Destination')
+                    conn_info = {
+                        'origin': elem.get('name'),
+                        'source': origin.text if origin is not None else '',
+                        'destination': destination.text if destination is not None else ''
+                    }
+                    self.connections.append(conn_info)
+                    elem.clear()
+
+            return root is not None
         except Exception as e:
             st.error(f"Error parsing workflow: {str(e)}")
             return False
     
     def _identify_tool_type(self, plugin):
         """Identify the Alteryx tool type from plugin name"""
-        tool_mapping = {
-            'AlteryxBasePluginsEngine.dll': {
-                'Input': 'input_data',
-                'Output': 'output_data',
-                'Select': 'select',
-                'Filter': 'filter',
-                'Formula': 'formula',
-                'Join': 'join',
-                'Sort': 'sort',
-                'Unique': 'unique',
-                'Sample': 'sample',
-                'Summarize': 'summarize',
-                'RecordID': 'record_id'
-            },
-            'AlteryxBasePluginsGui.dll': {
-                'BrowseV2': 'browse',
-                'TextInput': 'text_input'
-            }
-        }
-        
         # Try to extract tool type from plugin path
-        for key in tool_mapping:
-            if key in plugin:
-                return 'base_tool'
+        if any(dll in plugin for dll in _PLUGIN_DLLS):
+            return 'base_tool'
+        return 'unknown'
+
+    @staticmethod
+    def _classify(plugin, config):
+        """Compute a canonical tool kind once, at parse time.
+
+        Code generation used to re-stringify the config dict for every
+        elif case per tool; doing the substring probes a single time
+        here lets _generate_tool_code dispatch on a plain string.
+        """
+        plugin_lower = str(plugin).lower()
+        if 'input' in plugin_lower:
+            return 'input'
+        if 'output' in plugin_lower:
+            return 'output'
+
+        config_str = str(config).lower()
+        for keyword, kind in (('select', 'select'),
+                              ('filter', 'filter'),
+                              ('sort', 'sort'),
+                              ('join', 'join'),
+                              ('summarize', 'summarize'),
+                              ('formula', 'formula'),
+                              ('unique', 'unique'),
+                              ('sample', 'sample'),
+                              ('recordid', 'record_id')):
+            if keyword in config_str:
+                return kind
         return 'unknown'
     
     def _extract_config(self, properties):
@@ -87,7 +176,7 @@ class AlteryxWorkflowAnalyzer:
         config = {}
         
         # Configuration node
-        configuration = properties.find('.//Configuration')
+        configuration = properties.find('Configuration')
         if configuration is not None:
             for child in configuration:
                 config[child.tag] = child.text or child.attrib
@@ -96,9 +185,9 @@ class AlteryxWorkflowAnalyzer:
     
     def _extract_gui_settings(self, node):
         """Extract GUI settings from node"""
-        gui = node.find('.//GuiSettings')
+        gui = node.find('GuiSettings')
         if gui is not None:
-            position = gui.find('.//Position')
+            position = gui.find('Position')
             if position is not None:
                 return {
                     'x': position.get('x'),
@@ -107,7 +196,14 @@ class AlteryxWorkflowAnalyzer:
         return {}
     
     def analyze_workflow(self):
-        """Analyze the workflow structure"""
+        """Analyze the workflow structure.
+
+        The result is cached on the instance — analyzer state is
+        immutable after parse, and tab2 calls this on every rerun.
+        """
+        if self._analysis_cache is not None:
+            return self._analysis_cache
+
         analysis = {
             'total_tools': len(self.tools),
             'total_connections': len(self.connections),
@@ -121,14 +217,15 @@ class AlteryxWorkflowAnalyzer:
             tool_type = tool['type']
             analysis['tool_types'][tool_type] = analysis['tool_types'].get(tool_type, 0) + 1
             
-            # Categorize tools
-            if 'input' in str(tool['plugin']).lower() or 'Input' in str(tool['config']):
+            # Categorize tools on the kind computed at parse time
+            if tool['kind'] == 'input':
                 analysis['inputs'].append(tool)
-            elif 'output' in str(tool['plugin']).lower() or 'Output' in str(tool['config']):
+            elif tool['kind'] == 'output':
                 analysis['outputs'].append(tool)
             else:
                 analysis['transformations'].append(tool)
-        
+
+        self._analysis_cache = analysis
         return analysis
     
     def generate_python_code(self):
@@ -142,11 +239,25 @@ class AlteryxWorkflowAnalyzer:
         code_lines.append("import pandas as pd")
         code_lines.append("import numpy as np")
         code_lines.append("from datetime import datetime")
+        # Remember where an optional numba import can be spliced in once
+        # the tool handlers below have decided whether they need it
+        numba_import_at = len(code_lines)
         code_lines.append("")
-        
+        code_lines.append("# Final DataFrames are registered here so callers can")
+        code_lines.append("# inspect results without re-reading the output files")
+        code_lines.append("_output_dfs = {}")
+        code_lines.append("")
+        self._uses_numba = False
+
         # Create a mapping of tool IDs to variable names
         tool_vars = {}
-        
+
+        # Index connections by destination once so the per-tool source
+        # lookups below are O(1) instead of a scan of all connections
+        self._by_dest = {}
+        for conn in self.connections:
+            self._by_dest.setdefault(conn['destination'], []).append(conn['source'])
+
         # Sort tools based on connections (topological sort)
         sorted_tools = self._topological_sort()
         
@@ -158,138 +269,233 @@ class AlteryxWorkflowAnalyzer:
             # Generate code based on tool type
             code_segment = self._generate_tool_code(tool, tool_vars)
             if code_segment:
-                code_lines.extend(code_segment)
+                code_lines.append(code_segment)
                 code_lines.append("")
-        
+
+        if self._uses_numba:
+            code_lines.insert(numba_import_at, "from numba import njit")
+
         return "\n".join(code_lines)
     
     def _topological_sort(self):
-        """Sort tools in execution order based on connections"""
-        # Simple implementation: return tools in original order
-        # In production, implement proper topological sorting
-        return self.tools
+        """Sort tools in execution order based on connections.
+
+        Kahn's algorithm: repeatedly emit tools with no unprocessed
+        inputs and release their dependents. O(tools + connections),
+        and raises CycleDetectedError if the connections form a loop.
+        """
+        tools_by_id = {t['id']: t for t in self.tools}
+        dep_count = {tool_id: 0 for tool_id in tools_by_id}
+        by_source = {}
+        for conn in self.connections:
+            source, dest = conn['source'], conn['destination']
+            if source in dep_count and dest in dep_count:
+                dep_count[dest] += 1
+                by_source.setdefault(source, []).append(dest)
+
+        ready = deque(t for t in self.tools if dep_count[t['id']] == 0)
+        ordered = []
+        while ready:
+            tool = ready.popleft()
+            ordered.append(tool)
+            for dest in by_source.get(tool['id'], ()):
+                dep_count[dest] -= 1
+                if dep_count[dest] == 0:
+                    ready.append(tools_by_id[dest])
+
+        if len(ordered) < len(self.tools):
+            raise CycleDetectedError("Workflow connections contain a cycle")
+        return ordered
     
     def _generate_tool_code(self, tool, tool_vars):
-        """Generate Python code for a specific tool"""
-        code = []
+        """Generate Python code for a specific tool.
+
+        Handlers return a single pre-joined string per tool (or '' when
+        there is nothing to emit) so the caller appends one buffer entry
+        per tool rather than many per-line fragments.
+        """
+        handler = self._HANDLERS.get(tool['kind'])
+        if handler is None:
+            return ''
+        return handler(self, tool, tool_vars)
+
+    def _gen_input(self, tool, tool_vars):
         tool_id = tool['id']
         var_name = tool_vars[tool_id]
-        
-        # Input Data Tool
-        if 'input' in str(tool['plugin']).lower():
-            config = tool['config']
-            filename = config.get('File', 'input.csv')
-            code.append(f"# Input Data Tool (ID: {tool_id})")
-            code.append(f"# Original file: {filename}")
-            code.append(f"{var_name} = pd.read_csv('{filename}')")
-            self.input_files[tool_id] = filename
-        
-        # Output Data Tool
-        elif 'output' in str(tool['plugin']).lower():
-            config = tool['config']
-            filename = config.get('File', 'output.csv')
-            
-            # Find the source tool
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, var_name)
-                code.append(f"# Output Data Tool (ID: {tool_id})")
-                code.append(f"# Output file: {filename}")
-                code.append(f"{source_var}.to_csv('{filename}', index=False)")
-                self.output_specs.append({'id': tool_id, 'file': filename, 'var': source_var})
-        
-        # Select Tool
-        elif 'select' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Select Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.copy()")
-        
-        # Filter Tool
-        elif 'filter' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Filter Tool (ID: {tool_id})")
-                code.append(f"# Add your filter condition here")
-                code.append(f"{var_name} = {source_var}[{source_var}['column'] > 0]  # Example filter")
-        
-        # Sort Tool
-        elif 'sort' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Sort Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.sort_values('column')  # Specify column")
-        
-        # Join Tool
-        elif 'join' in str(tool['config']).lower():
-            sources = self._find_all_source_tools(tool_id)
-            if len(sources) >= 2:
-                left_var = tool_vars.get(sources[0], 'df1')
-                right_var = tool_vars.get(sources[1], 'df2')
-                code.append(f"# Join Tool (ID: {tool_id})")
-                code.append(f"{var_name} = pd.merge({left_var}, {right_var}, on='key_column', how='inner')")
-        
-        # Summarize Tool
-        elif 'summarize' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Summarize Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.groupby('group_column').agg({{'value_column': 'sum'}})")
-        
-        # Formula Tool
-        elif 'formula' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Formula Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.copy()")
-                code.append(f"{var_name}['new_column'] = {var_name}['existing_column'] * 2  # Example formula")
-        
-        # Unique Tool
-        elif 'unique' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Unique Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.drop_duplicates()")
-        
-        # Sample Tool
-        elif 'sample' in str(tool['config']).lower():
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Sample Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.sample(n=100)  # Specify sample size")
-        
-        # Record ID Tool
-        elif 'recordid' in str(tool['config']).lower() or 'RecordID' in str(tool['config']):
-            source_tool = self._find_source_tool(tool_id)
-            if source_tool:
-                source_var = tool_vars.get(source_tool, 'df')
-                code.append(f"# Record ID Tool (ID: {tool_id})")
-                code.append(f"{var_name} = {source_var}.copy()")
-                code.append(f"{var_name}['RecordID'] = range(1, len({var_name}) + 1)")
-        
-        return code
+        filename = tool['config'].get('File', 'input.csv')
+        self.input_files[tool_id] = filename
+        return (f"# Input Data Tool (ID: {tool_id})\n"
+                f"# Original file: {filename}\n"
+                f"{var_name} = pd.read_csv('{filename}')")
+
+    def _gen_output(self, tool, tool_vars):
+        tool_id = tool['id']
+        filename = tool['config'].get('File', 'output.csv')
+
+        # Find the source tool
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, tool_vars[tool_id])
+        self.output_specs.append({'id': tool_id, 'file': filename, 'var': source_var})
+        return (f"# Output Data Tool (ID: {tool_id})\n"
+                f"# Output file: {filename}\n"
+                f"{source_var}.to_csv('{filename}', index=False)\n"
+                f"_output_dfs['{tool_id}'] = {source_var}")
+
+    def _gen_select(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        return (f"# Select Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = {source_var}.copy()")
+
+    def _gen_filter(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        var_name = tool_vars[tool_id]
+        if _is_numeric_expression(tool['config'].get('Expression')):
+            self._uses_numba = True
+            return (f"# Filter Tool (ID: {tool_id})\n"
+                    f"# Add your filter condition here\n"
+                    f"@njit(cache=True)\n"
+                    f"def _filter_{tool_id}(col):\n"
+                    f"    return col > 0  # Example filter\n"
+                    f"{var_name} = {source_var}[_filter_{tool_id}({source_var}['column'].to_numpy())]")
+        return (f"# Filter Tool (ID: {tool_id})\n"
+                f"# Add your filter condition here\n"
+                f"{var_name} = {source_var}[{source_var}['column'] > 0]  # Example filter")
+
+    def _gen_sort(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        return (f"# Sort Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = {source_var}.sort_values('column')  # Specify column")
+
+    def _gen_join(self, tool, tool_vars):
+        tool_id = tool['id']
+        sources = self._find_all_source_tools(tool_id)
+        if len(sources) < 2:
+            return ''
+        left_var = tool_vars.get(sources[0], 'df1')
+        right_var = tool_vars.get(sources[1], 'df2')
+        return (f"# Join Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = pd.merge({left_var}, {right_var}, on='key_column', how='inner')")
+
+    def _gen_summarize(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        return (f"# Summarize Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = {source_var}.groupby('group_column').agg({{'value_column': 'sum'}})")
+
+    def _gen_formula(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        var_name = tool_vars[tool_id]
+        if _is_numeric_expression(tool['config'].get('Expression')):
+            self._uses_numba = True
+            return (f"# Formula Tool (ID: {tool_id})\n"
+                    f"@njit(cache=True)\n"
+                    f"def _formula_{tool_id}(col):\n"
+                    f"    return col * 2  # Example formula\n"
+                    f"{var_name} = {source_var}.copy()\n"
+                    f"{var_name}['new_column'] = _formula_{tool_id}({var_name}['existing_column'].to_numpy())")
+        return (f"# Formula Tool (ID: {tool_id})\n"
+                f"{var_name} = {source_var}.copy()\n"
+                f"{var_name}['new_column'] = {var_name}['existing_column'] * 2  # Example formula")
+
+    def _gen_unique(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        return (f"# Unique Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = {source_var}.drop_duplicates()")
+
+    def _gen_sample(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        return (f"# Sample Tool (ID: {tool_id})\n"
+                f"{tool_vars[tool_id]} = {source_var}.sample(n=100)  # Specify sample size")
+
+    def _gen_record_id(self, tool, tool_vars):
+        tool_id = tool['id']
+        source_tool = self._find_source_tool(tool_id)
+        if not source_tool:
+            return ''
+        source_var = tool_vars.get(source_tool, 'df')
+        var_name = tool_vars[tool_id]
+        return (f"# Record ID Tool (ID: {tool_id})\n"
+                f"{var_name} = {source_var}.copy()\n"
+                f"{var_name}['RecordID'] = np.arange(1, len({var_name}) + 1, dtype=np.int64)")
+
+    # Kind -> handler dispatch table; a single hash lookup replaces the
+    # former elif chain of stringified-config probes
+    _HANDLERS = {
+        'input': _gen_input,
+        'output': _gen_output,
+        'select': _gen_select,
+        'filter': _gen_filter,
+        'sort': _gen_sort,
+        'join': _gen_join,
+        'summarize': _gen_summarize,
+        'formula': _gen_formula,
+        'unique': _gen_unique,
+        'sample': _gen_sample,
+        'record_id': _gen_record_id
+    }
     
     def _find_source_tool(self, tool_id):
         """Find the source tool that feeds into this tool"""
-        for conn in self.connections:
-            if conn['destination'] == tool_id:
-                return conn['source']
-        return None
-    
+        sources = self._by_dest.get(tool_id)
+        return sources[0] if sources else None
+
     def _find_all_source_tools(self, tool_id):
         """Find all source tools that feed into this tool"""
-        sources = []
-        for conn in self.connections:
-            if conn['destination'] == tool_id:
-                sources.append(conn['source'])
-        return sources
+        return self._by_dest.get(tool_id, [])
+
+
+@st.cache_data(show_spinner=False)
+def _tool_type_table(tool_types):
+    """Build the tool-type distribution frame from two columnar arrays
+    rather than a list of row tuples; memoized across reruns."""
+    return pd.DataFrame({
+        'Tool Type': list(tool_types),
+        'Count': list(tool_types.values())
+    })
+
+
+@st.cache_data(show_spinner=False)
+def _parse_and_generate(content):
+    """Parse workflow bytes and generate Python code, memoized by
+    Streamlit across reruns so repeat uploads of the same content skip
+    the parse entirely."""
+    analyzer = AlteryxWorkflowAnalyzer()
+    if not analyzer.parse_workflow(content):
+        return None, None
+    try:
+        return analyzer, analyzer.generate_python_code()
+    except CycleDetectedError as e:
+        st.error(f"Error generating code: {str(e)}")
+        return None, None
 
 
 def main():
@@ -332,25 +538,26 @@ def main():
         )
         
         if uploaded_file is not None:
-            # Read the file
-            content = uploaded_file.read()
-            
-            # Store in session state
-            if 'workflow_content' not in st.session_state or st.session_state.workflow_content != content:
-                st.session_state.workflow_content = content
-                st.session_state.analyzer = AlteryxWorkflowAnalyzer()
-                
-                # Parse the workflow
-                with st.spinner("Parsing workflow..."):
-                    success = st.session_state.analyzer.parse_workflow(content)
-                
-                if success:
+            # Compare a 16-byte blake2b fingerprint instead of the raw
+            # upload bytes on every rerun; the heavy work is memoized by
+            # st.cache_data keyed on the content itself
+            content = uploaded_file.getvalue()
+            file_key = hashlib.blake2b(content, digest_size=16).digest()
+
+            if st.session_state.get('workflow_key') != file_key:
+                st.session_state.workflow_key = file_key
+
+                with st.spinner("Parsing workflow and generating code..."):
+                    analyzer, generated_code = _parse_and_generate(content)
+
+                if analyzer is not None:
+                    st.session_state.analyzer = analyzer
+                    st.session_state.generated_code = generated_code
+                    # Compile once here; code objects aren't picklable so
+                    # this can't live inside the cached function
+                    st.session_state.code_obj = compile(
+                        generated_code, '<alteryx_gen>', 'exec')
                     st.success("✅ Workflow parsed successfully!")
-                    
-                    # Generate Python code
-                    with st.spinner("Generating Python code..."):
-                        st.session_state.generated_code = st.session_state.analyzer.generate_python_code()
-                    
                     st.success("✅ Python code generated!")
                 else:
                     st.error("❌ Failed to parse workflow")
@@ -359,10 +566,12 @@ def main():
         st.markdown("---")
         if st.button("📝 Load Example Workflow"):
             example_workflow = create_example_workflow()
-            st.session_state.workflow_content = example_workflow
+            st.session_state.workflow_key = None
             st.session_state.analyzer = AlteryxWorkflowAnalyzer()
             st.session_state.analyzer.parse_workflow(example_workflow)
             st.session_state.generated_code = st.session_state.analyzer.generate_python_code()
+            st.session_state.code_obj = compile(
+                st.session_state.generated_code, '<alteryx_gen>', 'exec')
             st.success("✅ Example workflow loaded!")
     
     with tab2:
@@ -386,10 +595,7 @@ def main():
                 # Tool breakdown
                 st.subheader("📊 Tool Types Distribution")
                 if analysis['tool_types']:
-                    tool_df = pd.DataFrame(
-                        list(analysis['tool_types'].items()),
-                        columns=['Tool Type', 'Count']
-                    )
+                    tool_df = _tool_type_table(analysis['tool_types'])
                     st.dataframe(tool_df, use_container_width=True)
                 
                 # Workflow structure
@@ -466,14 +672,11 @@ def main():
                 with st.spinner("Executing..."):
                     try:
                         # Create execution environment
-                        exec_globals = {
-                            'pd': pd,
-                            'np': __import__('numpy'),
-                            'datetime': datetime
-                        }
-                        
-                        # Execute the generated code
-                        exec(st.session_state.generated_code, exec_globals)
+                        exec_globals = dict(_EXEC_GLOBALS_TEMPLATE)
+
+                        # Execute the pre-compiled code object; compiling
+                        # happens once at generation time, not per click
+                        exec(st.session_state.code_obj, exec_globals)
                         
                         st.success("✅ Code executed successfully!")
                         
@@ -481,25 +684,25 @@ def main():
                         if st.session_state.analyzer.output_specs:
                             st.subheader("📊 Output Results")
                             
+                            output_dfs = exec_globals.get('_output_dfs', {})
                             for output_spec in st.session_state.analyzer.output_specs:
                                 output_file = output_spec['file']
-                                
-                                if os.path.exists(output_file):
+                                df = output_dfs.get(output_spec['id'])
+
+                                if df is not None:
+                                    # The executed script registered the
+                                    # final frame; no need to read the
+                                    # file back from disk
                                     st.write(f"**{output_file}:**")
-                                    
-                                    # Read and display the output
-                                    if output_file.endswith('.csv'):
-                                        df = pd.read_csv(output_file)
-                                        st.dataframe(df, use_container_width=True)
-                                        
-                                        # Download button
-                                        with open(output_file, 'rb') as f:
-                                            st.download_button(
-                                                label=f"📥 Download {output_file}",
-                                                data=f,
-                                                file_name=output_file,
-                                                mime="text/csv"
-                                            )
+                                    st.dataframe(df, use_container_width=True)
+
+                                    csv_bytes = df.to_csv(index=False).encode()
+                                    st.download_button(
+                                        label=f"📥 Download {output_file}",
+                                        data=csv_bytes,
+                                        file_name=output_file,
+                                        mime="text/csv"
+                                    )
                     
                     except Exception as e:
                         st.error(f"❌ Execution error: {str(e)}")
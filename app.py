@@ -1,12 +1,33 @@
 import streamlit as st
 import pandas as pd
+import functools
+import hashlib
 import io
 import os
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from advanced_parser import AdvancedAlteryxParser
-from code_generator import PythonCodeGenerator
+from code_generator import PythonCodeGenerator, requirements_for
+
+try:
+    # Imported once at startup rather than inside Tab 2 on every rerun
+    import plotly.express as px
+except ImportError:
+    px = None
+
+# Parsing runs off the script-runner thread so widget events stay
+# responsive while a large workflow is being processed
+_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+# st.fragment is stable from Streamlit 1.37 (experimental from 1.33);
+# on older versions, down to the requirements floor, fall back so the
+# decorated sections simply rerun with the whole page
+_fragment = (getattr(st, 'fragment', None)
+             or getattr(st, 'experimental_fragment', None)
+             or (lambda f: f))
 
 # Page configuration
 st.set_page_config(
@@ -58,6 +79,95 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_data(show_spinner=False, max_entries=16)
+def _parse_cached(content_digest, _stream):
+    """Parse a workflow stream, memoized on its content digest.
+
+    The stream argument is underscore-prefixed so Streamlit keys the
+    cache on the digest alone; the digest itself is computed zero-copy
+    from the upload's buffer by the caller. Returns the parser's
+    picklable state dict (or None on failure) so reruns rehydrate
+    instead of re-parsing.
+    """
+    _stream.seek(0)
+    parser = AdvancedAlteryxParser()
+    if not parser.parse_stream(_stream):
+        return None
+    return parser.__getstate__()
+
+@st.cache_data(show_spinner=False)
+def _encoded_code(source):
+    """Encode the generated script once per distinct string"""
+    return source.encode('utf-8')
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _codegen_cached(parser_state):
+    """Generate code from cached parser state, memoized likewise.
+
+    Returns the script plus the generator's import bitmask so the
+    requirements download can declare exactly what was emitted.
+    """
+    generator = PythonCodeGenerator(_restore_parser(parser_state))
+    return generator.generate(), int(generator.imports)
+
+def _restore_parser(state):
+    """Rehydrate a parser from its cached state dict"""
+    parser = AdvancedAlteryxParser.__new__(AdvancedAlteryxParser)
+    parser.__setstate__(state)
+    return parser
+
+# Reader dispatch by extension: one dict lookup instead of chained
+# endswith branches, and new formats slot in without touching callers
+_read_excel = functools.partial(pd.read_excel, engine='openpyxl')
+READERS = {
+    '.csv': pd.read_csv,
+    '.xlsx': _read_excel,
+    '.xls': _read_excel,
+    '.txt': pd.read_csv
+}
+
+def _register_input_file(filename, df):
+    """Spill an uploaded frame to parquet and keep only preview
+    metadata in session state.
+
+    Session state is carried across every rerun, so holding full
+    DataFrames there is O(rows x cols) per input; the parquet file is
+    reloaded lazily at Execute time instead.
+    """
+    parquet_path = f"{filename}.parquet"
+    df.to_parquet(parquet_path)
+    st.session_state.input_files[filename] = {
+        'head': df.head(10),
+        'shape': df.shape,
+        'columns': tuple(df.columns),
+        'path': parquet_path
+    }
+
+def _read_uploaded_table(uploaded_input, filename):
+    """Read an uploaded tabular file into a DataFrame.
+
+    CSVs go through pyarrow's multithreaded reader when available,
+    falling back to the default engine; Excel files are read with
+    openpyxl explicitly.
+    """
+    reader = READERS.get(os.path.splitext(filename)[1].lower(), pd.read_csv)
+    if reader is pd.read_csv:
+        try:
+            return pd.read_csv(uploaded_input, engine='pyarrow', dtype_backend='pyarrow')
+        except ImportError:
+            uploaded_input.seek(0)
+    return reader(uploaded_input)
+
+@st.cache_resource(show_spinner=False)
+def _tool_pie(workflow_sig, tool_df_records):
+    """Build the tool-distribution pie once per workflow.
+
+    Plotly figure construction is Python-heavy JSON assembly; caching on
+    the workflow signature skips it on every tab switch or widget flip.
+    """
+    df = pd.DataFrame(tool_df_records)
+    return px.pie(df, values='Count', names='Tool Type', title='Tool Distribution')
+
 def initialize_session_state():
     """Initialize session state variables"""
     if 'parser' not in st.session_state:
@@ -70,6 +180,15 @@ def initialize_session_state():
         st.session_state.execution_results = {}
     if 'input_files' not in st.session_state:
         st.session_state.input_files = {}
+    if 'required_input_files' not in st.session_state:
+        st.session_state.required_input_files = frozenset()
+
+def _required_input_files(parser):
+    """Filenames every input tool needs, computed once per parse"""
+    return frozenset(
+        tool['config'].get('File', tool['config'].get('FileName', ''))
+        for tool in parser.tools_by_type.get('input_data', ())
+    )
 
 def create_sample_workflow():
     """Create a sample Alteryx workflow for testing"""
@@ -226,20 +345,26 @@ def create_sample_data():
     """Create sample CSV data for testing"""
     import pandas as pd
     import numpy as np
-    
-    np.random.seed(42)
+
+    # Generator API (PCG64) avoids the legacy global-state RNG and draws
+    # each column in one vectorized call
+    rng = np.random.default_rng(42)
     n_records = 100
-    
+
+    regions = np.array(['North', 'South', 'East', 'West'])
+    products = np.array(['Product A', 'Product B', 'Product C'])
+
     df = pd.DataFrame({
-        'OrderID': range(1, n_records + 1),
-        'Region': np.random.choice(['North', 'South', 'East', 'West'], n_records),
-        'Amount': np.random.uniform(500, 5000, n_records).round(2),
-        'Product': np.random.choice(['Product A', 'Product B', 'Product C'], n_records),
+        'OrderID': np.arange(1, n_records + 1),
+        'Region': regions[rng.integers(0, len(regions), size=n_records)],
+        'Amount': rng.uniform(500, 5000, n_records).round(2),
+        'Product': products[rng.integers(0, len(products), size=n_records)],
         'Date': pd.date_range('2024-01-01', periods=n_records, freq='D')
     })
-    
+
     return df
 
+@_fragment
 def sidebar_info():
     """Render sidebar information"""
     with st.sidebar:
@@ -287,6 +412,216 @@ def sidebar_info():
         st.markdown("---")
         st.info("💡 **Tip**: Start with the sample workflow to see how it works!")
 
+@_fragment
+def _render_analysis():
+    """Render the Analysis tab.
+
+    Fragment-scoped: sidebar toggles and widgets in other tabs no
+    longer re-run this rendering work on their reruns.
+    """
+    st.header("Workflow Analysis")
+    
+    if st.session_state.workflow_uploaded and st.session_state.parser:
+        parser = st.session_state.parser
+        
+        # Metadata
+        st.subheader("📊 Workflow Metadata")
+        metadata_col1, metadata_col2 = st.columns(2)
+        
+        with metadata_col1:
+            st.write(f"**Version:** {parser.metadata.get('version', 'Unknown')}")
+            st.write(f"**Tools:** {len(parser.tools)}")
+        
+        with metadata_col2:
+            st.write(f"**Connections:** {len(parser.connections)}")
+            execution_order = parser.get_execution_order()
+            st.write(f"**Execution Steps:** {len(execution_order)}")
+        
+        st.markdown("---")
+        
+        # Tool breakdown
+        st.subheader("🔧 Tools Breakdown")
+        
+        # value_counts does the counting and descending sort in one
+        # C-level pass instead of a Python dict loop + sorted()
+        tool_df = (pd.Series([tool['type'] for tool in parser.tools])
+                   .value_counts()
+                   .rename_axis('Tool Type')
+                   .reset_index(name='Count'))
+
+        if not tool_df.empty:
+
+            col1, col2 = st.columns([2, 1])
+
+            with col1:
+                # st.table is the cheaper render path for tiny frames
+                if len(tool_df) <= 20:
+                    st.table(tool_df)
+                else:
+                    st.dataframe(tool_df, use_container_width=True, hide_index=True)
+
+            with col2:
+                if len(tool_df) < 2:
+                    # A one-slice pie isn't worth the figure assembly
+                    st.write(f"All tools are of type **{tool_df['Tool Type'].iloc[0]}**")
+                elif px is None:
+                    st.error("❌ plotly is not installed — see requirements.txt")
+                else:
+                    fig = _tool_pie((id(parser), len(parser.tools)),
+                                    tool_df.to_dict('records'))
+                    st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("---")
+        
+        # Execution flow
+        st.subheader("🔄 Execution Flow")
+        
+        execution_order = parser.get_execution_order()
+
+        # Row tuples + explicit columns: the id index makes each lookup
+        # O(1) and from_records skips per-dict column inference
+        tools_by_id = parser.tools_by_id
+        flow_rows = [
+            (idx, tool_id, tool['type'], tool['annotation'] or '-')
+            for idx, tool_id in enumerate(execution_order, 1)
+            if (tool := tools_by_id.get(tool_id)) is not None
+        ]
+
+        if flow_rows:
+            flow_df = pd.DataFrame.from_records(
+                flow_rows, columns=['Step', 'Tool ID', 'Type', 'Annotation'])
+            if len(flow_df) <= 20:
+                st.table(flow_df)
+            else:
+                st.dataframe(flow_df, use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        
+        # Detailed tool information
+        st.subheader("📋 Detailed Tool Information")
+
+        # One Arrow-serialized grid instead of several widgets per tool;
+        # connections come from the parse-time adjacency indexes
+        summary_df = pd.DataFrame.from_records(
+            [
+                (
+                    tool['id'],
+                    tool['type'],
+                    tool['plugin'],
+                    tool['annotation'] or '-',
+                    ', '.join(parser.get_source_tools(tool['id'])) or '-',
+                    ', '.join(parser.get_destination_tools(tool['id'])) or '-'
+                )
+                for tool in parser.tools
+            ],
+            columns=['ID', 'Type', 'Plugin', 'Annotation', 'From', 'To'])
+        if len(summary_df) > 20 and not st.checkbox("Show all tools", value=False):
+            summary_df = summary_df.head(20)
+        st.dataframe(summary_df, use_container_width=True, hide_index=True)
+
+        # Full JSON views are built on demand for one tool at a time
+        selected_id = st.selectbox(
+            "🔎 Inspect tool",
+            options=list(tools_by_id),
+            format_func=lambda tid: f"Tool {tid}: {tools_by_id[tid]['type']}"
+        )
+        if selected_id is not None:
+            tool = tools_by_id[selected_id]
+            col1, col2 = st.columns(2)
+
+            with col1:
+                st.write("**Basic Info:**")
+                st.json({
+                    'ID': tool['id'],
+                    'Type': tool['type'],
+                    'Plugin': tool['plugin']
+                })
+
+            with col2:
+                st.write("**Position:**")
+                st.json(tool['gui'])
+
+            if tool['config']:
+                st.write("**Configuration:**")
+                st.json(tool['config'])
+    
+    else:
+        st.info("👆 Please upload a workflow file first")
+
+@_fragment
+def _render_generated_code():
+    """Render the Generated Code tab, fragment-scoped likewise"""
+    st.header("Generated Python Code")
+    
+    if st.session_state.generated_code:
+        st.subheader("📝 Complete Script")
+        
+        # Display code
+        st.code(st.session_state.generated_code, language='python', line_numbers=True)
+        
+        # Action buttons
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            # Timestamp fixed at generation time: a per-rerun now() would
+            # change the widget identity and re-send the payload bytes
+            # to the browser on every redraw
+            st.download_button(
+                label="📥 Download Python Script",
+                data=_encoded_code(st.session_state.generated_code),
+                file_name=f"alteryx_workflow_{st.session_state.get('codegen_timestamp', 'export')}.py",
+                mime="text/x-python",
+                use_container_width=True
+            )
+        
+        with col2:
+            # Derived from the generator's import bitmask so the file
+            # matches what the script actually needs (numba, pyarrow, ...)
+            st.download_button(
+                label="📥 Download Requirements",
+                data=requirements_for(
+                    st.session_state.get('codegen_imports', 0))
+                or "pandas>=2.0.0\nnumpy>=1.24.0",
+                file_name="requirements.txt",
+                mime="text/plain",
+                use_container_width=True
+            )
+        
+        with col3:
+            if st.button("📋 Copy to Clipboard", use_container_width=True):
+                st.info("💡 Use the copy button in the code block above")
+        
+        # Code statistics
+        st.markdown("---")
+        st.subheader("📊 Code Statistics")
+        
+        # One pass over the script, counters only; no per-category
+        # line lists kept alive for the rest of the rerun
+        total = code_count = comment_count = blank_count = 0
+        for line in st.session_state.generated_code.splitlines():
+            total += 1
+            stripped = line.strip()
+            if not stripped:
+                blank_count += 1
+            elif stripped.startswith('#'):
+                comment_count += 1
+            else:
+                code_count += 1
+
+        stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
+
+        with stat_col1:
+            st.metric("Total Lines", total)
+        with stat_col2:
+            st.metric("Code Lines", code_count)
+        with stat_col3:
+            st.metric("Comments", comment_count)
+        with stat_col4:
+            st.metric("Blank Lines", blank_count)
+    
+    else:
+        st.info("👆 Please upload a workflow file first")
+
 def main():
     initialize_session_state()
     sidebar_info()
@@ -320,21 +655,44 @@ def main():
             
             if uploaded_file is not None:
                 try:
-                    content = uploaded_file.read()
-                    
-                    with st.spinner("🔄 Parsing workflow..."):
-                        parser = AdvancedAlteryxParser()
-                        success = parser.parse(content)
-                        
-                        if success:
+                    # getbuffer() exposes the upload's bytes as a
+                    # memoryview, so hashing doesn't copy the file;
+                    # the parse itself streams from the file object
+                    digest = hashlib.blake2b(uploaded_file.getbuffer(),
+                                             digest_size=16).hexdigest()
+
+                    if st.session_state.get('parse_digest') != digest:
+                        st.session_state.parse_digest = digest
+                        st.session_state.parse_future = _EXECUTOR.submit(
+                            _parse_cached, digest, uploaded_file)
+
+                    parse_future = st.session_state.parse_future
+                    if not parse_future.done():
+                        st.info("⏳ Parsing workflow in the background...")
+                        time.sleep(0.1)
+                        st.rerun()
+                    elif st.session_state.get('codegen_digest') == digest:
+                        # Already restored and generated for this upload;
+                        # a full rerun with the file still in the uploader
+                        # must not redo the work (or churn the download
+                        # button's timestamped identity)
+                        pass
+                    else:
+                        parser_state = parse_future.result()
+
+                        if parser_state is not None:
+                            parser = _restore_parser(parser_state)
                             st.session_state.parser = parser
                             st.session_state.workflow_uploaded = True
-                            
+                            st.session_state.required_input_files = _required_input_files(parser)
+
                             # Generate code
                             with st.spinner("🔄 Generating Python code..."):
-                                generator = PythonCodeGenerator(parser)
-                                st.session_state.generated_code = generator.generate()
-                            
+                                (st.session_state.generated_code,
+                                 st.session_state.codegen_imports) = _codegen_cached(parser_state)
+                                st.session_state.codegen_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                            st.session_state.codegen_digest = digest
+
                             st.success("✅ Workflow parsed and code generated successfully!")
                             
                             # Show quick stats
@@ -366,182 +724,28 @@ def main():
                 parser.parse(sample_workflow)
                 st.session_state.parser = parser
                 st.session_state.workflow_uploaded = True
+                st.session_state.required_input_files = _required_input_files(parser)
                 
                 generator = PythonCodeGenerator(parser)
                 st.session_state.generated_code = generator.generate()
+                st.session_state.codegen_imports = int(generator.imports)
+                st.session_state.codegen_timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
                 
                 # Create sample data
                 sample_df = create_sample_data()
                 sample_df.to_csv('sales_data.csv', index=False)
-                st.session_state.input_files['sales_data.csv'] = sample_df
+                _register_input_file('sales_data.csv', sample_df)
                 
                 st.success("✅ Sample workflow loaded!")
                 st.rerun()
     
     # Tab 2: Analysis
     with tab2:
-        st.header("Workflow Analysis")
-        
-        if st.session_state.workflow_uploaded and st.session_state.parser:
-            parser = st.session_state.parser
-            
-            # Metadata
-            st.subheader("📊 Workflow Metadata")
-            metadata_col1, metadata_col2 = st.columns(2)
-            
-            with metadata_col1:
-                st.write(f"**Version:** {parser.metadata.get('version', 'Unknown')}")
-                st.write(f"**Tools:** {len(parser.tools)}")
-            
-            with metadata_col2:
-                st.write(f"**Connections:** {len(parser.connections)}")
-                execution_order = parser.get_execution_order()
-                st.write(f"**Execution Steps:** {len(execution_order)}")
-            
-            st.markdown("---")
-            
-            # Tool breakdown
-            st.subheader("🔧 Tools Breakdown")
-            
-            tool_types = {}
-            for tool in parser.tools:
-                tool_type = tool['type']
-                tool_types[tool_type] = tool_types.get(tool_type, 0) + 1
-            
-            if tool_types:
-                tool_df = pd.DataFrame([
-                    {'Tool Type': k, 'Count': v} 
-                    for k, v in sorted(tool_types.items(), key=lambda x: x[1], reverse=True)
-                ])
-                
-                col1, col2 = st.columns([2, 1])
-                
-                with col1:
-                    st.dataframe(tool_df, use_container_width=True, hide_index=True)
-                
-                with col2:
-                    import plotly.express as px
-                    fig = px.pie(tool_df, values='Count', names='Tool Type', title='Tool Distribution')
-                    st.plotly_chart(fig, use_container_width=True)
-            
-            st.markdown("---")
-            
-            # Execution flow
-            st.subheader("🔄 Execution Flow")
-            
-            execution_order = parser.get_execution_order()
-            
-            flow_data = []
-            for idx, tool_id in enumerate(execution_order, 1):
-                tool = parser.get_tool_by_id(tool_id)
-                if tool:
-                    flow_data.append({
-                        'Step': idx,
-                        'Tool ID': tool_id,
-                        'Type': tool['type'],
-                        'Annotation': tool['annotation'] or '-'
-                    })
-            
-            if flow_data:
-                flow_df = pd.DataFrame(flow_data)
-                st.dataframe(flow_df, use_container_width=True, hide_index=True)
-            
-            st.markdown("---")
-            
-            # Detailed tool information
-            st.subheader("📋 Detailed Tool Information")
-            
-            for tool in parser.tools:
-                with st.expander(f"Tool {tool['id']}: {tool['type']} - {tool['annotation'] or 'No annotation'}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("**Basic Info:**")
-                        st.json({
-                            'ID': tool['id'],
-                            'Type': tool['type'],
-                            'Plugin': tool['plugin']
-                        })
-                    
-                    with col2:
-                        st.write("**Position:**")
-                        st.json(tool['gui'])
-                    
-                    if tool['config']:
-                        st.write("**Configuration:**")
-                        st.json(tool['config'])
-                    
-                    # Show connections
-                    sources = parser.get_source_tools(tool['id'])
-                    destinations = parser.get_destination_tools(tool['id'])
-                    
-                    if sources or destinations:
-                        st.write("**Connections:**")
-                        if sources:
-                            st.write(f"  ⬅️ From: {', '.join(sources)}")
-                        if destinations:
-                            st.write(f"  ➡️ To: {', '.join(destinations)}")
-        
-        else:
-            st.info("👆 Please upload a workflow file first")
+        _render_analysis()
     
     # Tab 3: Generated Code
     with tab3:
-        st.header("Generated Python Code")
-        
-        if st.session_state.generated_code:
-            st.subheader("📝 Complete Script")
-            
-            # Display code
-            st.code(st.session_state.generated_code, language='python', line_numbers=True)
-            
-            # Action buttons
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                st.download_button(
-                    label="📥 Download Python Script",
-                    data=st.session_state.generated_code,
-                    file_name=f"alteryx_workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}.py",
-                    mime="text/x-python",
-                    use_container_width=True
-                )
-            
-            with col2:
-                st.download_button(
-                    label="📥 Download Requirements",
-                    data="pandas>=2.0.0\nnumpy>=1.24.0\nopenpyxl>=3.1.0",
-                    file_name="requirements.txt",
-                    mime="text/plain",
-                    use_container_width=True
-                )
-            
-            with col3:
-                if st.button("📋 Copy to Clipboard", use_container_width=True):
-                    st.info("💡 Use the copy button in the code block above")
-            
-            # Code statistics
-            st.markdown("---")
-            st.subheader("📊 Code Statistics")
-            
-            lines = st.session_state.generated_code.split('\n')
-            code_lines = [l for l in lines if l.strip() and not l.strip().startswith('#')]
-            comment_lines = [l for l in lines if l.strip().startswith('#')]
-            blank_lines = [l for l in lines if not l.strip()]
-            
-            stat_col1, stat_col2, stat_col3, stat_col4 = st.columns(4)
-            
-            with stat_col1:
-                st.metric("Total Lines", len(lines))
-            with stat_col2:
-                st.metric("Code Lines", len(code_lines))
-            with stat_col3:
-                st.metric("Comments", len(comment_lines))
-            with stat_col4:
-                st.metric("Blank Lines", len(blank_lines))
-        
-        else:
-            st.info("👆 Please upload a workflow file first")
+        _render_generated_code()
     
     # Tab 4: Input Files
     with tab4:
@@ -550,8 +754,8 @@ def main():
         if st.session_state.workflow_uploaded and st.session_state.parser:
             st.write("Upload the input files required by your workflow:")
             
-            # Find all input tools
-            input_tools = [tool for tool in st.session_state.parser.tools if tool['type'] == 'input_data']
+            # Input tools come from the by-type index built at parse time
+            input_tools = st.session_state.parser.tools_by_type.get('input_data', [])
             
             if input_tools:
                 for tool in input_tools:
@@ -573,16 +777,12 @@ def main():
                         if uploaded_input is not None:
                             try:
                                 # Read and save the file
-                                if filename.endswith('.csv'):
-                                    df = pd.read_csv(uploaded_input)
-                                elif filename.endswith(('.xlsx', '.xls')):
-                                    df = pd.read_excel(uploaded_input)
-                                else:
-                                    df = pd.read_csv(uploaded_input)
-                                
-                                # Save to disk
-                                df.to_csv(filename, index=False)
-                                st.session_state.input_files[filename] = df
+                                df = _read_uploaded_table(uploaded_input, filename)
+
+                                # Spilled to parquet; execution reads it
+                                # back through __inputs__, so no CSV
+                                # round trip and no dtype loss
+                                _register_input_file(filename, df)
                                 
                                 st.success(f"✅ {filename} uploaded successfully!")
                                 
@@ -597,9 +797,10 @@ def main():
                     with col2:
                         if filename in st.session_state.input_files:
                             st.success("✅ Loaded")
-                            df = st.session_state.input_files[filename]
-                            st.metric("Rows", f"{len(df):,}")
-                            st.metric("Columns", len(df.columns))
+                            entry = st.session_state.input_files[filename]
+                            n_rows, n_cols = entry['shape']
+                            st.metric("Rows", f"{n_rows:,}")
+                            st.metric("Columns", n_cols)
             else:
                 st.info("ℹ️ No input tools found in workflow")
         
@@ -611,14 +812,12 @@ def main():
         st.header("Execute Python Code")
         
         if st.session_state.generated_code:
-            # Check if input files are ready
-            input_tools = [tool for tool in st.session_state.parser.tools if tool['type'] == 'input_data']
-            input_files_ready = all(
-                tool['config'].get('File', tool['config'].get('FileName', '')) in st.session_state.input_files
-                for tool in input_tools
-            )
-            
-            if not input_files_ready and input_tools:
+            # Check readiness with one set-subset test against the
+            # filenames precomputed at parse time
+            required_files = st.session_state.required_input_files
+            input_files_ready = required_files <= st.session_state.input_files.keys()
+
+            if not input_files_ready and required_files:
                 st.warning("⚠️ Please upload all required input files in the 'Input Files' tab before executing")
             
             st.markdown("---")
@@ -632,7 +831,13 @@ def main():
                             'pd': pd,
                             'np': __import__('numpy'),
                             'datetime': datetime,
-                            '__name__': '__main__'
+                            '__name__': '__main__',
+                            # Reload spilled inputs from parquet only
+                            # when actually executing
+                            '__inputs__': {
+                                name: pd.read_parquet(entry['path'])
+                                for name, entry in st.session_state.input_files.items()
+                            }
                         }
                         
                         # Capture print output
@@ -643,9 +848,18 @@ def main():
                         sys.stdout = output_capture = io.StringIO()
                         
                         try:
+                            # Compile once per distinct script; repeat
+                            # Execute presses reuse the code object
+                            key = hash(st.session_state.generated_code)
+                            if st.session_state.get('_compiled_key') != key:
+                                st.session_state._compiled = compile(
+                                    st.session_state.generated_code,
+                                    '<alteryx>', 'exec', optimize=2)
+                                st.session_state._compiled_key = key
+
                             # Execute the code
-                            exec(st.session_state.generated_code, exec_globals)
-                            
+                            exec(st.session_state._compiled, exec_globals)
+
                             # Get output
                             output = output_capture.getvalue()
                         finally:
@@ -662,45 +876,30 @@ def main():
                         st.markdown("---")
                         st.subheader("📊 Output Results")
                         
-                        output_tools = [tool for tool in st.session_state.parser.tools if tool['type'] == 'output_data']
-                        
-                        for tool in output_tools:
-                            config = tool['config']
-                            output_file = config.get('File', config.get('FileName_Out', 'output.csv'))
-                            
-                            if os.path.exists(output_file):
-                                st.write(f"**{output_file}:**")
-                                
-                                try:
-                                    if output_file.endswith('.csv'):
-                                        df = pd.read_csv(output_file)
-                                    elif output_file.endswith(('.xlsx', '.xls')):
-                                        df = pd.read_excel(output_file)
-                                    else:
-                                        df = pd.read_csv(output_file)
-                                    
-                                    # Display
-                                    col1, col2 = st.columns([3, 1])
-                                    
-                                    with col1:
-                                        st.dataframe(df, use_container_width=True)
-                                    
-                                    with col2:
-                                        st.metric("Rows", f"{len(df):,}")
-                                        st.metric("Columns", len(df.columns))
-                                        
-                                        # Download button
-                                        with open(output_file, 'rb') as f:
-                                            st.download_button(
-                                                label=f"📥 Download",
-                                                data=f,
-                                                file_name=output_file,
-                                                mime="text/csv" if output_file.endswith('.csv') else "application/vnd.ms-excel",
-                                                use_container_width=True
-                                            )
-                                
-                                except Exception as e:
-                                    st.error(f"Error reading output file: {str(e)}")
+                        # The generated script registers each written
+                        # frame in __outputs__; display and offer
+                        # downloads from memory instead of re-reading
+                        # the files it just wrote
+                        for output_file, df in exec_globals.get('__outputs__', {}).items():
+                            st.write(f"**{output_file}:**")
+
+                            # Display
+                            col1, col2 = st.columns([3, 1])
+
+                            with col1:
+                                st.dataframe(df, use_container_width=True)
+
+                            with col2:
+                                st.metric("Rows", f"{len(df):,}")
+                                st.metric("Columns", len(df.columns))
+
+                                st.download_button(
+                                    label=f"📥 Download",
+                                    data=df.to_csv(index=False).encode(),
+                                    file_name=output_file,
+                                    mime="text/csv" if output_file.endswith('.csv') else "application/vnd.ms-excel",
+                                    use_container_width=True
+                                )
                     
                     except Exception as e:
                         st.error(f"❌ Execution error: {str(e)}")
@@ -712,12 +911,4 @@ def main():
             st.info("👆 Please upload a workflow file first")
 
 if __name__ == "__main__":
-    # Install plotly if not available
-    try:
-        import plotly.express as px
-    except ImportError:
-        st.warning("Installing plotly for visualizations...")
-        os.system("pip install plotly --break-system-packages")
-        st.rerun()
-    
     main()
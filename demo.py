@@ -3,6 +3,10 @@
 Demo script showing how to use the Alteryx converter programmatically
 """
 
+import os
+from datetime import datetime
+
+import numpy as np
 import pandas as pd
 from advanced_parser import AdvancedAlteryxParser
 from code_generator import PythonCodeGenerator
@@ -183,13 +187,13 @@ def demo_with_sample_data():
     try:
         exec_globals = {
             'pd': pd,
-            'np': __import__('numpy'),
-            'datetime': __import__('datetime').datetime
+            'np': np,
+            'datetime': datetime
         }
         exec(code, exec_globals)
-        
+
         # Read and display the output
-        if pd.io.common.file_exists('output.csv'):
+        if os.path.exists('output.csv'):
             output_df = pd.read_csv('output.csv')
             print("✅ Execution successful!")
             print()